@@ -1,95 +1,134 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
+from finance_etl.io_utils import filter_fact_to_month, pick_col, read_parquet
+from finance_etl.transform import add_margin_cols, infer_month, month_series
+
 try:
+    import plotly
     import plotly.express as px
+    import plotly.io as pio
+    from plotly.offline import get_plotlyjs_version
 except ImportError as e:
     raise SystemExit("Missing dependency: plotly. Install with: pip install plotly") from e
 
 
 KPI_COLS = ["Asset", "COGS", "Expense", "Revenue", "gross_profit", "operating_profit"]
-
-
-def _read_parquet(path: Path) -> pd.DataFrame:
-    return pd.read_parquet(path) if path.exists() else pd.DataFrame()
-
-
-def _read_csv(path: Path) -> pd.DataFrame:
-    return pd.read_csv(path) if path.exists() else pd.DataFrame()
-
-
-def _pick_col(df: pd.DataFrame, candidates: list[str]) -> str | None:
-    for c in candidates:
+AMOUNT_COLS = ["amount_base", "amount", "amount_tzs", "amount_usd"]
+ACCOUNT_COLS = ["account_code", "gl_account", "account"]
+DIM_COLS = ["account_code", "account_name", "account_type"]
+CATEGORY_COLS = ["entity", "account_code", "account_type", "movement_type", "currency"]
+INPUT_FILES = [
+    "fact_transactions.parquet",
+    "dim_accounts.parquet",
+    "kpi_monthly.parquet",
+    "dq_exceptions.csv",
+    "dq_summary.csv",
+]
+FRAGMENTS = ["kpi_chart_html", "kpi_chart2_html", "kpi_table_html", "exp_chart_html", "dq_sum_html", "dq_ex_html"]
+CACHE_DIR = Path("reports") / ".cache"
+DQ_SAMPLE_ROWS = 200
+MAX_POINTS = 1000  # per trace; the charts are a few hundred pixels wide
+PLOTLY_CDN = f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+
+
+def _read_csv(path: Path, max_rows: int | None = None) -> pd.DataFrame:
+    # zero-byte files count as missing; max_rows stops the parser once the displayed rows are in
+    if not path.exists() or path.stat().st_size == 0:
+        return pd.DataFrame()
+    return pd.read_csv(path, nrows=max_rows)
+
+
+def _as_category(df: pd.DataFrame) -> pd.DataFrame:
+    # low-cardinality keys: int-coded categoricals make groupby/merge hash codes instead of strings
+    for c in CATEGORY_COLS:
         if c in df.columns:
-            return c
-    return None
-
-
-def _to_month_str(x) -> str:
-    if pd.isna(x):
-        return ""
-    if isinstance(x, str):
-        return x[:7]
-    try:
-        return pd.to_datetime(x).strftime("%Y-%m")
-    except Exception:
-        return str(x)[:7]
-
-
-def _infer_month(kpi: pd.DataFrame) -> str | None:
-    if kpi.empty:
-        return None
-    if "month" not in kpi.columns:
-        return None
-    months = sorted({_to_month_str(m) for m in kpi["month"].dropna().unique()})
-    return months[-1] if months else None
-
-
-def _filter_fact_to_month(fact: pd.DataFrame, month: str) -> pd.DataFrame:
-    date_col = _pick_col(fact, ["tx_date", "date", "transaction_date", "posting_date", "invoice_date"])
-    if not date_col or fact.empty:
-        return fact.copy()
-    m = pd.to_datetime(fact[date_col], errors="coerce").dt.strftime("%Y-%m")
-    return fact.loc[m == month].copy()
-
-
-def _add_margin_cols(kpi: pd.DataFrame) -> pd.DataFrame:
-    out = kpi.copy()
-    if "Revenue" in out.columns:
-        rev = pd.to_numeric(out["Revenue"], errors="coerce")
-        if "gross_profit" in out.columns:
-            gp = pd.to_numeric(out["gross_profit"], errors="coerce")
-            out["gross_margin_pct"] = (gp / rev) * 100
-        if "operating_profit" in out.columns:
-            op = pd.to_numeric(out["operating_profit"], errors="coerce")
-            out["operating_margin_pct"] = (op / rev) * 100
+            df[c] = df[c].astype("category")
+    return df
+
+
+def _fmt_amount(s: pd.Series) -> pd.Series:
+    return pd.to_numeric(s, errors="coerce").map("{:,.2f}".format, na_action="ignore").fillna("")
+
+
+def _lttb_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of n_out points that preserve the visual shape of y."""
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=np.float64)
+    y = np.nan_to_num(y)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[hi:nxt_hi].mean(), y[hi:nxt_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
     return out
 
 
-def build_dashboard(curated_dir: Path, month: str | None, out_html: Path) -> Path:
-    curated_dir = curated_dir.resolve()
+def _downsample(df: pd.DataFrame, y: str, n_out: int = MAX_POINTS) -> pd.DataFrame:
+    # df is sorted by month; thin each entity's series independently
+    groups = df.groupby("entity", observed=True, sort=False)
+    sizes = groups.size()
+    # no groups (empty frame or all-null entity) has nothing to thin
+    if sizes.empty or sizes.max() <= n_out:
+        return df
+    parts = [g.iloc[_lttb_indices(g[y].to_numpy(dtype=np.float64, na_value=np.nan), n_out)] for _, g in groups]
+    return pd.concat(parts).sort_values(["month", "entity"])
+
+
+def _fig_div(fig, div_id: str) -> str:
+    # serialise once and mount with Plotly.newPlot; plotly.js itself is loaded once in <head>
+    spec = pio.to_json(fig, validate=False, pretty=False)
+    return (
+        f'<div id="{div_id}"></div>'
+        f"<script>(function(){{var f={spec};"
+        f'Plotly.newPlot("{div_id}",f.data,f.layout,{{responsive:true}});}})();</script>'
+    )
 
-    fact = _read_parquet(curated_dir / "fact_transactions.parquet")
-    dim = _read_parquet(curated_dir / "dim_accounts.parquet")
-    kpi = _read_parquet(curated_dir / "kpi_monthly.parquet")
-    dq_ex = _read_csv(curated_dir / "dq_exceptions.csv")
-    dq_sum = _read_csv(curated_dir / "dq_summary.csv")
-
-    month = month or _infer_month(kpi)
-    if not month:
-        raise SystemExit("Could not infer month. Provide --month YYYY-MM (e.g., 2025-12).")
 
+def _load_frames(curated_dir: Path, month: str) -> tuple[pd.DataFrame, ...]:
+    # only decode the columns the charts/tables actually touch; Arrow decoding releases the GIL,
+    # so the five independent reads overlap on a thread pool
+    fact_path = curated_dir / "fact_transactions.parquet"
+    with ThreadPoolExecutor(max_workers=len(INPUT_FILES)) as ex:
+        futures = (
+            ex.submit(filter_fact_to_month, fact_path, month, AMOUNT_COLS + ACCOUNT_COLS),
+            ex.submit(read_parquet, curated_dir / "dim_accounts.parquet", DIM_COLS),
+            ex.submit(read_parquet, curated_dir / "kpi_monthly.parquet", ["entity", "month"] + KPI_COLS),
+            ex.submit(_read_csv, curated_dir / "dq_exceptions.csv", DQ_SAMPLE_ROWS),
+            ex.submit(_read_csv, curated_dir / "dq_summary.csv", DQ_SAMPLE_ROWS),
+        )
+        fact_m, dim, kpi, dq_ex, dq_sum = (f.result() for f in futures)
+    return _as_category(fact_m), _as_category(dim), _as_category(kpi), dq_ex, dq_sum
+
+
+def _render_fragments(
+    month: str,
+    fact_m: pd.DataFrame,
+    dim: pd.DataFrame,
+    kpi: pd.DataFrame,
+    dq_ex: pd.DataFrame,
+    dq_sum: pd.DataFrame,
+) -> dict[str, str]:
     # --- KPI: normalize + enrich ---
-    kpi2 = kpi.copy()
-    if "month" in kpi2.columns:
-        kpi2["month"] = kpi2["month"].map(_to_month_str)
-
-    kpi2 = _add_margin_cols(kpi2)
+    kpi2 = kpi.assign(month=month_series(kpi["month"])) if "month" in kpi.columns else kpi
+    kpi2 = add_margin_cols(kpi2)
 
     # KPI charts (Revenue + operating_profit)
     kpi_chart_html = "<p class='muted'>No KPI chart available.</p>"
@@ -97,81 +136,145 @@ def build_dashboard(curated_dir: Path, month: str | None, out_html: Path) -> Pat
 
     if not kpi2.empty and all(c in kpi2.columns for c in ["entity", "month", "Revenue"]):
         # keep top entities by Revenue across all months for readability
-        top_entities = kpi2.groupby("entity")["Revenue"].sum().sort_values(ascending=False).head(8).index.tolist()
+        revenue_by_entity = kpi2.groupby("entity", observed=True)["Revenue"].sum()
+        top_entities = revenue_by_entity.sort_values(ascending=False).head(8).index.tolist()
         kpi_top = kpi2.loc[kpi2["entity"].isin(top_entities)].sort_values(["month", "entity"])
 
         fig = px.line(
-            kpi_top,
+            _downsample(kpi_top, "Revenue"),
             x="month",
             y="Revenue",
             color="entity",
             markers=True,
             title="Revenue Trend (Top Entities)",
         )
-        kpi_chart_html = fig.to_html(full_html=False, include_plotlyjs="cdn")
+        kpi_chart_html = _fig_div(fig, "kpi-revenue")
 
         if "operating_profit" in kpi_top.columns:
             fig2 = px.line(
-                kpi_top,
+                _downsample(kpi_top, "operating_profit"),
                 x="month",
                 y="operating_profit",
                 color="entity",
                 markers=True,
                 title="Operating Profit Trend (Top Entities)",
             )
-            kpi_chart2_html = fig2.to_html(full_html=False, include_plotlyjs=False)
+            kpi_chart2_html = _fig_div(fig2, "kpi-operating-profit")
 
     # KPI table for selected month
     kpi_table_html = "<p class='muted'>No KPI rows for this month.</p>"
     if not kpi2.empty and all(c in kpi2.columns for c in ["entity", "month"]):
-        kpi_m = kpi2.loc[kpi2["month"] == month].copy()
+        kpi_m = kpi2.loc[kpi2["month"] == month]
         keep = (
             ["entity", "month"]
             + [c for c in KPI_COLS if c in kpi_m.columns]
             + [c for c in ["gross_margin_pct", "operating_margin_pct"] if c in kpi_m.columns]
         )
         if not kpi_m.empty:
-            # formatting
-            for c in keep:
-                if c not in ["entity", "month"]:
-                    kpi_m[c] = pd.to_numeric(kpi_m[c], errors="coerce")
-            kpi_table_html = kpi_m[keep].sort_values("entity").to_html(index=False, float_format=lambda x: f"{x:,.2f}")
+            # format numeric columns to strings once instead of a per-cell float_format callback in to_html
+            table = kpi_m[keep].assign(**{c: _fmt_amount(kpi_m[c]) for c in keep[2:]})
+            kpi_table_html = table.sort_values("entity").to_html(index=False)
 
     # Expense chart (Top expense accounts, absolute value)
     exp_chart_html = "<p class='muted'>No expense chart available.</p>"
-    if not fact.empty:
-        fact_m = _filter_fact_to_month(fact, month)
-        amt_col = _pick_col(fact_m, ["amount_base", "amount", "amount_tzs", "amount_usd"])
-        acc_col = _pick_col(fact_m, ["account_code", "gl_account", "account"])
+    if not fact_m.empty:
+        cols = frozenset(fact_m.columns)
+        amt_col = pick_col(cols, AMOUNT_COLS)
+        acc_col = pick_col(cols, ACCOUNT_COLS)
+
+        if amt_col and acc_col:
+            # aggregate on the account's categorical codes; type/name lookups run per distinct code,
+            # and display labels are built only for the final top-k rows
+            acc = fact_m[acc_col].astype("category")
+            codes = acc.cat.codes.to_numpy()
+            cats = acc.cat.categories.astype(str)
+            keep = codes >= 0
+            name_map: dict[str, str] | None = None
+            if not dim.empty and "account_code" in dim.columns:
+                dim_codes = dim["account_code"].astype(str)
+                if "account_type" in dim.columns:
+                    type_map = dict(zip(dim_codes, dim["account_type"].astype(str), strict=True))
+                    cat_is_exp = np.asarray(cats.map(type_map).str.lower() == "expense", dtype=bool)
+                    # null accounts carry code -1, so only look up the valid codes
+                    keep[keep] = cat_is_exp[codes[keep]]
+                if "account_name" in dim.columns:
+                    name_map = dict(zip(dim_codes, dim["account_name"].astype(str), strict=True))
+
+            # one pass over contiguous arrays: per-account abs sums via bincount, then top-k via argpartition
+            amounts = pd.to_numeric(fact_m[amt_col], errors="coerce").to_numpy(dtype=np.float64, na_value=0.0)
+            sums = np.bincount(codes[keep], weights=np.abs(amounts[keep]), minlength=len(cats))
+            present = np.flatnonzero(np.bincount(codes[keep], minlength=len(cats)))
+            k = min(15, len(present))
+            top_idx = present[np.argpartition(-sums[present], k - 1)[:k]] if k else present
+            top_idx = top_idx[np.argsort(-sums[top_idx], kind="stable")]
+
+            top_codes = pd.Series(cats[top_idx], dtype=str)
+            label = top_codes if name_map is None else top_codes + " - " + top_codes.map(name_map).fillna("")
+            top = pd.DataFrame({"_label": label, "_abs": sums[top_idx]})
+            if not top.empty:
+                fig = px.bar(top, x="_abs", y="_label", orientation="h", title="Top Expense Accounts (Abs Value)")
+                exp_chart_html = _fig_div(fig, "expense-top")
 
-        if amt_col and acc_col and not fact_m.empty:
-            df = fact_m.copy()
+    # DQ tables
+    # DQ frames were read with nrows=DQ_SAMPLE_ROWS, so render them as-is
+    dq_sum_html = dq_sum.to_html(index=False) if not dq_sum.empty else "<p class='muted'>No dq_summary.csv</p>"
+    dq_ex_html = dq_ex.to_html(index=False) if not dq_ex.empty else "<p class='muted'>No dq_exceptions.csv</p>"
+
+    return {
+        "kpi_chart_html": kpi_chart_html,
+        "kpi_chart2_html": kpi_chart2_html,
+        "kpi_table_html": kpi_table_html,
+        "exp_chart_html": exp_chart_html,
+        "dq_sum_html": dq_sum_html,
+        "dq_ex_html": dq_ex_html,
+    }
+
+
+def _cache_key(curated_dir: Path, month: str) -> str:
+    # (path, mtime, size) of every input, plus this script so renderer changes invalidate too, plus the
+    # plotly version: fragments hold plotly-serialised JSON that must match the plotly.js loaded in <head>
+    stamps = [("plotly", plotly.__version__, get_plotlyjs_version())]
+    for p in [curated_dir / name for name in INPUT_FILES] + [Path(__file__).resolve()]:
+        st = p.stat() if p.exists() else None
+        stamps.append((str(p), st.st_mtime_ns if st else None, st.st_size if st else None))
+    return hashlib.blake2b(repr(stamps + [month]).encode(), digest_size=16).hexdigest()
+
+
+def _load_fragments(cache: Path) -> dict[str, str] | None:
+    paths = {name: cache / f"{name}.html" for name in FRAGMENTS}
+    if not all(p.exists() for p in paths.values()):
+        return None
+    return {name: p.read_text(encoding="utf-8") for name, p in paths.items()}
 
-            if not dim.empty and "account_code" in dim.columns and acc_col in df.columns:
-                df = df.merge(dim, left_on=acc_col, right_on="account_code", how="left", suffixes=("", "_dim"))
 
-            type_col = _pick_col(df, ["account_type", "type", "account_type_dim"])
-            if type_col:
-                df = df.loc[df[type_col].astype(str).str.lower().eq("expense")].copy()
+def _store_fragments(cache: Path, fragments: dict[str, str]) -> None:
+    # entries live at <cache_dir>/<month>/<key>; any other key for the month is stale (inputs or script changed)
+    if cache.parent.exists():
+        for stale in cache.parent.iterdir():
+            if stale != cache and stale.is_dir():
+                shutil.rmtree(stale, ignore_errors=True)
+    cache.mkdir(parents=True, exist_ok=True)
+    for name, html in fragments.items():
+        # write-then-rename so an interrupted build never leaves a truncated fragment behind
+        tmp = cache / f"{name}.html.tmp"
+        tmp.write_text(html, encoding="utf-8")
+        tmp.replace(cache / f"{name}.html")
 
-            name_col = _pick_col(df, ["account_name", "account_name_dim", "name"])
-            df["_label"] = df[acc_col].astype(str)
-            if name_col:
-                df["_label"] = df["_label"] + " - " + df[name_col].astype(str)
 
-            df["_abs"] = pd.to_numeric(df[amt_col], errors="coerce").abs()
-            top = df.groupby("_label")["_abs"].sum().sort_values(ascending=False).head(15).reset_index()
-            if not top.empty:
-                fig = px.bar(top, x="_abs", y="_label", orientation="h", title="Top Expense Accounts (Abs Value)")
-                exp_chart_html = fig.to_html(full_html=False, include_plotlyjs=False)
+def build_dashboard(curated_dir: Path, month: str | None, out_html: Path, cache_dir: Path | None = None) -> Path:
+    curated_dir = curated_dir.resolve()
 
-    # DQ tables
-    dq_sum_html = (
-        dq_sum.head(200).to_html(index=False) if not dq_sum.empty else "<p class='muted'>No dq_summary.csv</p>"
-    )
-    dq_ex_html = (
-        dq_ex.head(200).to_html(index=False) if not dq_ex.empty else "<p class='muted'>No dq_exceptions.csv</p>"
-    )
+    month = month or infer_month(read_parquet(curated_dir / "kpi_monthly.parquet", ["month"]))
+    if not month:
+        raise SystemExit("Could not infer month. Provide --month YYYY-MM (e.g., 2025-12).")
+
+    # unchanged inputs + month -> reuse the rendered charts/tables (opt-in; the CLI enables it by default)
+    cache = cache_dir / month / _cache_key(curated_dir, month) if cache_dir is not None else None
+    fragments = _load_fragments(cache) if cache is not None else None
+    if fragments is None:
+        fragments = _render_fragments(month, *_load_frames(curated_dir, month))
+        if cache is not None:
+            _store_fragments(cache, fragments)
 
     # Build HTML
     out_html.parent.mkdir(parents=True, exist_ok=True)
@@ -182,6 +285,7 @@ def build_dashboard(curated_dir: Path, month: str | None, out_html: Path) -> Pat
 <head>
   <meta charset="utf-8"/>
   <title>Finance Dashboard - {month}</title>
+  <script src="{PLOTLY_CDN}"></script>
   <style>
     body {{ font-family: Arial, sans-serif; margin: 24px; }}
     .muted {{ color: #666; font-size: 12px; }}
@@ -197,26 +301,26 @@ def build_dashboard(curated_dir: Path, month: str | None, out_html: Path) -> Pat
 
   <div class="card">
     <h2>KPI Trend</h2>
-    {kpi_chart_html}
+    {fragments['kpi_chart_html']}
     <br/>
-    {kpi_chart2_html}
+    {fragments['kpi_chart2_html']}
   </div>
 
   <div class="card">
     <h2>KPIs (Selected Month)</h2>
-    {kpi_table_html}
+    {fragments['kpi_table_html']}
   </div>
 
   <div class="card">
     <h2>Expense Breakdown</h2>
-    {exp_chart_html}
+    {fragments['exp_chart_html']}
   </div>
 
   <div class="card">
     <h2>Data Quality Summary</h2>
-    {dq_sum_html}
+    {fragments['dq_sum_html']}
     <h3>DQ Exceptions (sample)</h3>
-    {dq_ex_html}
+    {fragments['dq_ex_html']}
   </div>
 </body>
 </html>"""
@@ -230,15 +334,18 @@ def main() -> int:
     ap.add_argument("--curated-dir", default="data/curated")
     ap.add_argument("--month", default=None, help="YYYY-MM (e.g., 2025-12). If omitted, will infer from KPI file.")
     ap.add_argument("--out", default=None, help="Default: reports/<month>/dashboard.html")
+    ap.add_argument("--cache-dir", default=str(CACHE_DIR), help="Rendered fragment cache (default: reports/.cache)")
+    ap.add_argument("--no-cache", action="store_true", help="Always re-render charts/tables")
     args = ap.parse_args()
 
     curated = Path(args.curated_dir)
-    month = args.month or _infer_month(_read_parquet(curated / "kpi_monthly.parquet"))
+    # month inference only needs the month column, not the whole KPI table
+    month = args.month or infer_month(read_parquet(curated / "kpi_monthly.parquet", ["month"]))
     if not month:
         raise SystemExit("Could not infer month. Provide --month YYYY-MM.")
 
     out = Path(args.out) if args.out else Path("reports") / month / "dashboard.html"
-    final = build_dashboard(curated, month, out)
+    final = build_dashboard(curated, month, out, cache_dir=None if args.no_cache else Path(args.cache_dir))
     print(str(final.resolve()))
     return 0
 
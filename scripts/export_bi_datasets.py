@@ -1,58 +1,58 @@
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
 
-KPI_COLS = ["entity", "month", "Asset", "COGS", "Expense", "Revenue", "gross_profit", "operating_profit"]
-
+from finance_etl.io_utils import filter_fact_to_month, read_parquet
+from finance_etl.transform import add_margin_cols, infer_month, month_series
 
-def _read_parquet(path: Path) -> pd.DataFrame:
-    return pd.read_parquet(path) if path.exists() else pd.DataFrame()
+KPI_COLS = ["entity", "month", "Asset", "COGS", "Expense", "Revenue", "gross_profit", "operating_profit"]
 
 
 def _read_csv(path: Path) -> pd.DataFrame:
-    return pd.read_csv(path) if path.exists() else pd.DataFrame()
-
-
-def _month_from_any(x) -> str:
-    if pd.isna(x):
-        return ""
-    if isinstance(x, str):
-        return x[:7]
+    if not path.exists():
+        return pd.DataFrame()
     try:
-        return pd.to_datetime(x).strftime("%Y-%m")
-    except Exception:
-        return str(x)[:7]
-
-
-def _infer_month(kpi: pd.DataFrame) -> str | None:
-    if kpi.empty or "month" not in kpi.columns:
-        return None
-    months = sorted({_month_from_any(m) for m in kpi["month"].dropna().unique()})
-    return months[-1] if months else None
-
-
-def _filter_fact_to_month(fact: pd.DataFrame, month: str) -> pd.DataFrame:
-    for col in ["tx_date", "date", "transaction_date", "posting_date", "invoice_date"]:
-        if col in fact.columns:
-            m = pd.to_datetime(fact[col], errors="coerce").dt.strftime("%Y-%m")
-            return fact.loc[m == month].copy()
-    return fact.copy()
-
-
-def _add_margin_cols(kpi: pd.DataFrame) -> pd.DataFrame:
-    out = kpi.copy()
-    if "Revenue" in out.columns:
-        rev = pd.to_numeric(out["Revenue"], errors="coerce")
-        if "gross_profit" in out.columns:
-            gp = pd.to_numeric(out["gross_profit"], errors="coerce")
-            out["gross_margin_pct"] = (gp / rev) * 100
-        if "operating_profit" in out.columns:
-            op = pd.to_numeric(out["operating_profit"], errors="coerce")
-            out["operating_margin_pct"] = (op / rev) * 100
-    return out
+        # empty text cells are nulls, as with pd.read_csv (not "")
+        table = pacsv.read_csv(
+            path,
+            read_options=pacsv.ReadOptions(use_threads=True),
+            convert_options=pacsv.ConvertOptions(strings_can_be_null=True),
+        )
+        return table.to_pandas(self_destruct=True)
+    except pa.ArrowInvalid:
+        # mixed-type columns across blocks: let pandas widen them to object
+        return pd.read_csv(path)
+
+
+def _write_csv(df: pd.DataFrame, path: Path) -> None:
+    """
+    Writes df with Arrow's multithreaded CSV writer. The files parse back to the same values, but the text
+    differs from DataFrame.to_csv: headers and strings are quoted, booleans are true/false, and all-null
+    rows are blank lines. Frames Arrow cannot convert (mixed-type object columns) fall back to to_csv.
+    """
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        df.to_csv(path, index=False)
+        return
+    for i, field in enumerate(table.schema):
+        col = table.column(i)
+        if not pa.types.is_timestamp(field.type):
+            continue
+        # like DataFrame.to_csv: date-only timestamps are written as YYYY-MM-DD, and whole-second
+        # timestamps without a fractional part (Arrow would otherwise print .000000)
+        if pc.all(pc.equal(pc.floor_temporal(col, unit="day"), col)).as_py():
+            table = table.set_column(i, field.name, pc.cast(col, pa.date32()))
+        elif pc.all(pc.equal(pc.floor_temporal(col, unit="second"), col)).as_py():
+            table = table.set_column(i, field.name, pc.cast(col, pa.timestamp("s", tz=field.type.tz)))
+    pacsv.write_csv(table, path, write_options=pacsv.WriteOptions(include_header=True))
 
 
 def main() -> int:
@@ -64,35 +64,39 @@ def main() -> int:
 
     curated = Path(args.curated_dir)
 
-    fact = _read_parquet(curated / "fact_transactions.parquet")
-    dim_accounts = _read_parquet(curated / "dim_accounts.parquet")
-    kpi = _read_parquet(curated / "kpi_monthly.parquet")
-    dq_ex = _read_csv(curated / "dq_exceptions.csv")
-    dq_sum = _read_csv(curated / "dq_summary.csv")
+    # independent reads overlap on a thread pool (Arrow decoding releases the GIL);
+    # the fact scan waits for the month, which may have to be inferred from KPI
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        futures = (
+            ex.submit(read_parquet, curated / "dim_accounts.parquet"),
+            ex.submit(read_parquet, curated / "kpi_monthly.parquet", KPI_COLS),
+            ex.submit(_read_csv, curated / "dq_exceptions.csv"),
+            ex.submit(_read_csv, curated / "dq_summary.csv"),
+        )
+        dim_accounts, kpi, dq_ex, dq_sum = (f.result() for f in futures)
 
     # normalize month to YYYY-MM
     if not kpi.empty and "month" in kpi.columns:
-        kpi = kpi.copy()
-        kpi["month"] = kpi["month"].map(_month_from_any)
+        kpi["month"] = month_series(kpi["month"])
 
-    month = args.month or _infer_month(kpi)
+    month = args.month or infer_month(kpi)
     if not month:
         raise SystemExit("Could not infer month. Provide --month YYYY-MM.")
 
     out_dir = Path(args.out_dir) if args.out_dir else Path("data") / "bi" / month
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    # fact filtered to month (if a date column exists)
-    fact_m = _filter_fact_to_month(fact, month)
+    # fact filtered to month (if a date column exists); the frame is ours, so add the column in place
+    fact_m = filter_fact_to_month(curated / "fact_transactions.parquet", month)
     if not fact_m.empty:
         fact_m["month"] = month
 
     # KPI enriched + filtered
-    kpi2 = _add_margin_cols(kpi)
+    kpi2 = add_margin_cols(kpi)
     if not kpi2.empty and "month" in kpi2.columns:
-        kpi_m = kpi2.loc[kpi2["month"] == month].copy()
+        kpi_m = kpi2.loc[kpi2["month"] == month]
     else:
-        kpi_m = kpi2.copy()
+        kpi_m = kpi2
 
     # Keep KPI columns in a stable order (if present)
     keep_kpi = [c for c in KPI_COLS if c in kpi_m.columns] + [
@@ -102,11 +106,11 @@ def main() -> int:
         kpi_m = kpi_m[keep_kpi]
 
     # Write CSVs (Power BI/Tableau friendly)
-    fact_m.to_csv(out_dir / "fact_transactions.csv", index=False)
-    dim_accounts.to_csv(out_dir / "dim_accounts.csv", index=False)
-    kpi_m.to_csv(out_dir / "kpi_monthly.csv", index=False)
-    dq_sum.to_csv(out_dir / "dq_summary.csv", index=False)
-    dq_ex.to_csv(out_dir / "dq_exceptions.csv", index=False)
+    _write_csv(fact_m, out_dir / "fact_transactions.csv")
+    _write_csv(dim_accounts, out_dir / "dim_accounts.csv")
+    _write_csv(kpi_m, out_dir / "kpi_monthly.csv")
+    _write_csv(dq_sum, out_dir / "dq_summary.csv")
+    _write_csv(dq_ex, out_dir / "dq_exceptions.csv")
 
     # Simple schema dictionary
     dd_lines = []
@@ -3,19 +3,108 @@ from __future__ import annotations
 from pathlib import Path
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 
+_ARROW_TYPES = {str: pa.string(), float: pa.float64(), int: pa.int64()}
+FACT_DATE_COLS = ["tx_date", "date", "transaction_date", "posting_date", "invoice_date"]
 
-def read_csv(path: Path, **kwargs) -> pd.DataFrame:
+
+def read_csv(
+    path: Path,
+    dtype: dict[str, type] | None = None,
+    parse_dates: list[str] | None = None,
+) -> pd.DataFrame:
     if not path.exists():
         raise FileNotFoundError(f"Missing file: {path}")
-    return pd.read_csv(path, **kwargs)
+
+    # multithreaded Arrow parser with an explicit schema for the declared columns
+    column_types = {c: _ARROW_TYPES[t] for c, t in (dtype or {}).items()}
+    column_types.update({c: pa.timestamp("ns") for c in parse_dates or []})
+    try:
+        table = pacsv.read_csv(
+            path,
+            read_options=pacsv.ReadOptions(use_threads=True),
+            convert_options=pacsv.ConvertOptions(column_types=column_types, strings_can_be_null=True),
+        )
+    except pa.ArrowInvalid:
+        # values Arrow cannot convert (e.g. malformed dates) must still reach schema validation as DQ issues
+        return pd.read_csv(path, dtype=dtype, parse_dates=parse_dates)
+    return table.to_pandas(self_destruct=True)
 
 
 def write_parquet(df: pd.DataFrame, path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_parquet(path, index=False)
+    # dictionary-encode repeated strings (entity, account_code, currency, ...) and keep min/max
+    # statistics so downstream readers can prune row groups
+    pq.write_table(
+        pa.Table.from_pandas(df, preserve_index=False),
+        path,
+        compression="zstd",
+        compression_level=3,
+        use_dictionary=True,
+        data_page_size=1 << 20,
+        write_statistics=True,
+    )
 
 
 def write_csv(df: pd.DataFrame, path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     df.to_csv(path, index=False)
+
+
+def read_parquet(path: Path, columns: list[str] | None = None) -> pd.DataFrame:
+    # missing files read as an empty frame; only the requested columns that exist are decoded
+    if not path.exists():
+        return pd.DataFrame()
+    if columns is not None:
+        # probe the footer once so missing candidates are dropped instead of raising
+        names = set(pq.ParquetFile(path).schema_arrow.names)
+        columns = [c for c in columns if c in names]
+    return pq.read_table(path, columns=columns, use_threads=True).to_pandas(self_destruct=True)
+
+
+def pick_col(cols: frozenset[str], candidates: list[str]) -> str | None:
+    return next((c for c in candidates if c in cols), None)
+
+
+def filter_fact_to_month(fact_path: Path, month: str, columns: list[str] | None = None) -> pd.DataFrame:
+    # fact rows whose first FACT_DATE_COLS column falls in the YYYY-MM month; no date column -> all rows
+    if not fact_path.exists():
+        return pd.DataFrame()
+    dataset = ds.dataset(fact_path, format="parquet")
+    names = frozenset(dataset.schema.names)
+    if columns is not None:
+        columns = [c for c in columns if c in names]
+    date_col = pick_col(names, FACT_DATE_COLS)
+    if not date_col:
+        return dataset.to_table(columns=columns, use_threads=True).to_pandas(self_destruct=True)
+
+    start = pd.Timestamp(f"{month}-01")
+    end = start + pd.offsets.MonthBegin(1)
+    date_type = dataset.schema.field(date_col).type
+    if pa.types.is_timestamp(date_type) and date_type.tz is not None:
+        # month bounds are local to the column's zone, not UTC
+        start, end = start.tz_localize(date_type.tz), end.tz_localize(date_type.tz)
+    if pa.types.is_timestamp(date_type) or pa.types.is_date(date_type):
+        # push [start, end) into the scan so row groups outside the month are skipped via min/max stats
+        lo, hi = (start, end) if pa.types.is_timestamp(date_type) else (start.date(), end.date())
+        col = pc.field(date_col)
+        in_month = (col >= pa.scalar(lo, type=date_type)) & (col < pa.scalar(hi, type=date_type))
+        return dataset.to_table(columns=columns, filter=in_month, use_threads=True).to_pandas(self_destruct=True)
+
+    # date stored as text: no pushdown possible, parse after the read; filtering the Arrow table (not a
+    # .loc slice) hands back a frame the caller owns and can add columns to
+    read_cols = columns if columns is None or date_col in columns else columns + [date_col]
+    table = dataset.to_table(columns=read_cols, use_threads=True)
+    d = pd.to_datetime(table.column(date_col).to_pandas(), errors="coerce")
+    if d.dt.tz is not None:
+        # ISO strings with an offset parse tz-aware: bucket by their local month, like the Arrow path
+        start, end = start.tz_localize(d.dt.tz), end.tz_localize(d.dt.tz)
+    table = table.filter(pa.array(((d >= start) & (d < end)).to_numpy()))
+    if read_cols is not columns:
+        table = table.drop_columns([date_col])
+    return table.to_pandas(self_destruct=True)
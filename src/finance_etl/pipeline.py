@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 
 from .config import Settings
 from .io_utils import read_csv, write_csv, write_parquet
 from .quality import (
     add_severity,
+    dataset_labels,
     dq_overall_status,
     dq_summary_table,
     expenses_schema,
@@ -27,24 +32,53 @@ def _month_window(month: str) -> tuple[pd.Timestamp, pd.Timestamp]:
     return start, end
 
 
-def _dq_account_in_coa(df: pd.DataFrame, dataset: str, coa_codes: set[str], issues: list[pd.DataFrame]) -> None:
+def _month_slice(df: pd.DataFrame, col: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
     """
-    Adds DQ exceptions for rows whose account_code is not in Chart of Accounts.
+    Return rows with start <= df[col] < end.
+    Sorted date columns (the common case for ETL extracts) are sliced via binary search, no masks.
+    """
+    if df.empty:
+        return df
+    dates = df[col]
+    if pd.api.types.is_datetime64_any_dtype(dates) and dates.is_monotonic_increasing:
+        lo, hi = dates.searchsorted([start, end])
+        return df.iloc[lo:hi]
+    return df.loc[(dates >= start) & (dates < end)]
+
+
+def _dq_account_in_coa(df: pd.DataFrame, coa_codes: pa.Array) -> tuple[np.ndarray, np.ndarray] | None:
+    """
+    Returns (row index, account_code) arrays for rows whose account_code is not in Chart of Accounts.
+    `coa_codes` is an Arrow value set so the membership hash table is built in C++.
     """
     if df is None or df.empty or "account_code" not in df.columns:
-        return
+        return None
+
+    codes = pa.array(df["account_code"].astype(str), from_pandas=True)
+    bad_mask = pc.invert(pc.is_in(codes, value_set=coa_codes)).to_numpy(zero_copy_only=False)
+    if not bad_mask.any():
+        return None
+    return df.index.to_numpy()[bad_mask], df["account_code"].to_numpy()[bad_mask]
 
-    bad_mask = ~df["account_code"].astype(str).isin(coa_codes)
-    if bad_mask.any():
-        bad = df.loc[bad_mask, ["account_code"]].copy()
-        bad["dataset"] = dataset
-        bad["index"] = bad.index
-        bad["column"] = "account_code"
-        bad["check"] = "account_in_coa"
-        bad["failure_case"] = bad["account_code"]
-        bad["schema_context"] = "Column"
-        bad["check_number"] = None
-        issues.append(bad[["dataset", "index", "column", "check", "failure_case", "schema_context", "check_number"]])
+
+def _coa_exceptions(hits: list[tuple[str, np.ndarray, np.ndarray]]) -> pd.DataFrame:
+    """
+    Builds the account_in_coa DQ exceptions for all datasets in one frame.
+    """
+    datasets, index, codes = zip(*hits, strict=True)
+    exceptions = pd.DataFrame(
+        {
+            "dataset": dataset_labels(list(datasets), [len(i) for i in index]),
+            "index": np.concatenate(index),
+            "column": "account_code",
+            "check": "account_in_coa",
+            "failure_case": np.concatenate(codes),
+            "schema_context": "Column",
+            "check_number": None,
+        }
+    )
+    # same Arrow string labels as validate_or_collect, so the final concat keeps them Arrow-backed
+    return exceptions.astype({c: "string[pyarrow]" for c in ("column", "check", "schema_context")})
 
 
 def run_month(
@@ -72,7 +106,7 @@ def run_month(
     )
     dim_accounts = build_dim_accounts(coa)
 
-    coa_codes = set(dim_accounts["account_code"].astype(str).unique())
+    coa_codes = pa.array(dim_accounts["account_code"].astype(str).unique())
 
     # Raw (force IDs/codes to strings)
     sales = read_csv(
@@ -100,15 +134,24 @@ def run_month(
         parse_dates=["date"],
     )
 
-    # Validate raw + collect DQ issues
-    issues: list[pd.DataFrame] = []
-    v_sales = validate_or_collect(sales, sales_schema(settings.allowed_currencies), "sales", issues)
-    v_exp = validate_or_collect(expenses, expenses_schema(settings.allowed_currencies), "expenses", issues)
-    v_pay = validate_or_collect(payroll, payroll_schema(settings.allowed_currencies), "payroll", issues)
-    v_inv = validate_or_collect(inventory, inventory_schema(settings.allowed_currencies), "inventory_movements", issues)
-    v_fx = validate_or_collect(
-        fx_rates, fx_schema(settings.allowed_currencies, settings.base_currency), "fx_rates", issues
+    # Validate raw + collect DQ issues. The five schemas are independent and pandera's checks run in
+    # pandas/NumPy/Arrow kernels, so they validate on a thread pool; each dataset collects into its own
+    # list so the exceptions keep dataset order
+    checks = (
+        (sales, sales_schema(settings.allowed_currencies), "sales"),
+        (expenses, expenses_schema(settings.allowed_currencies), "expenses"),
+        (payroll, payroll_schema(settings.allowed_currencies), "payroll"),
+        (inventory, inventory_schema(settings.allowed_currencies), "inventory_movements"),
+        (fx_rates, fx_schema(settings.allowed_currencies, settings.base_currency), "fx_rates"),
     )
+    found: list[list[pd.DataFrame]] = [[] for _ in checks]
+    with ThreadPoolExecutor(max_workers=len(checks)) as ex:
+        futures = [
+            ex.submit(validate_or_collect, df, schema, name, out)
+            for (df, schema, name), out in zip(checks, found, strict=True)
+        ]
+        v_sales, v_exp, v_pay, v_inv, v_fx = (f.result() for f in futures)
+    issues: list[pd.DataFrame] = [fc for out in found for fc in out]
 
     # IMPORTANT: Some validate_or_collect implementations return None when issues exist.
     # We still want to proceed when fail_on allows it, so fallback to original dataframes.
@@ -123,8 +166,13 @@ def run_month(
     if v_fx is None:
         v_fx = fx_rates
 
-    _dq_account_in_coa(v_sales, "sales", coa_codes, issues)
-    _dq_account_in_coa(v_exp, "expenses", coa_codes, issues)
+    coa_hits = []
+    for dataset, df in (("sales", v_sales), ("expenses", v_exp)):
+        hit = _dq_account_in_coa(df, coa_codes)
+        if hit is not None:
+            coa_hits.append((dataset, *hit))
+    if coa_hits:
+        issues.append(_coa_exceptions(coa_hits))
 
     dq_exceptions_path = curated_dir / "dq_exceptions.csv"
     dq_summary_path = curated_dir / "dq_summary.csv"
@@ -133,7 +181,7 @@ def run_month(
         dq_exceptions = pd.concat(issues, ignore_index=True)
 
         # Add severity + compute audit-ready summary
-        dq_exceptions = add_severity(dq_exceptions)
+        dq_exceptions = add_severity(dq_exceptions, inplace=True)
         summary = dq_summary_table(dq_exceptions, fail_on=fail_on)
         overall = dq_overall_status(dq_exceptions, fail_on=fail_on)
 
@@ -164,10 +212,11 @@ def run_month(
     # Filter to month window
     start, end = _month_window(month)
 
-    v_sales = v_sales[(v_sales["date"] >= start) & (v_sales["date"] < end)].copy()
-    v_exp = v_exp[(v_exp["date"] >= start) & (v_exp["date"] < end)].copy()
-    v_inv = v_inv[(v_inv["date"] >= start) & (v_inv["date"] < end)].copy()
-    v_pay = v_pay[v_pay["month"] == month].copy()
+    # read-only downstream: to_fact_transactions copies its inputs before deriving columns
+    v_sales = _month_slice(v_sales, "date", start, end)
+    v_exp = _month_slice(v_exp, "date", start, end)
+    v_inv = _month_slice(v_inv, "date", start, end)
+    v_pay = v_pay[v_pay["month"] == month]
 
     fx = fx_to_base(v_fx, settings.base_currency)
 
@@ -1,18 +1,43 @@
 from __future__ import annotations
 
+import re
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 import pandera.pandas as pa
 from pandera import Check, Column
 
+# fixed-argument checks are built once at import and shared by every schema
+_GT0 = Check.gt(0)
+_GE0 = Check.ge(0)
+_NE0 = Check.ne(0)
+_MOVEMENT_TYPES = Check.isin(["receipt", "issue", "adjustment"])
+
 
 def _dup_check(keys: list[str], label: str) -> Check:
+    # hash the composite key to one uint64 column; duplicated() is a single hash pass with no group-size Series
     return Check(
-        lambda df: df.groupby(keys).size().max() == 1,
+        lambda df: not pd.util.hash_pandas_object(df[keys], index=False).duplicated().any(),
         element_wise=False,
         error=f"Duplicates found for keys {keys} in {label}",
     )
 
 
+@lru_cache(maxsize=16)
+def _currency_check(allowed_currencies: tuple[str, ...]) -> Check:
+    # one isin Check per currency set, shared by every currency column instead of a fresh list per column
+    return Check.isin(list(allowed_currencies))
+
+
+def _payroll_identity_ok(df: pd.DataFrame) -> bool:
+    # plain float64 arithmetic: no index alignment and no intermediate Series; NaN residuals are skipped
+    residual = df["gross"].to_numpy(dtype=np.float64) - df["deductions"].to_numpy(dtype=np.float64)
+    residual -= df["net"].to_numpy(dtype=np.float64)
+    return not (np.abs(residual, out=residual) >= 0.01).any()
+
+
+@lru_cache(maxsize=16)
 def sales_schema(allowed_currencies: tuple[str, ...]) -> pa.DataFrameSchema:
     return pa.DataFrameSchema(
         {
@@ -20,8 +45,8 @@ def sales_schema(allowed_currencies: tuple[str, ...]) -> pa.DataFrameSchema:
             "entity": Column(str, nullable=False),
             "invoice_id": Column(str, nullable=False),
             "account_code": Column(str, nullable=False),
-            "currency": Column(str, checks=Check.isin(list(allowed_currencies)), nullable=False),
-            "amount": Column(float, checks=Check.gt(0), coerce=True, nullable=False),
+            "currency": Column(str, checks=_currency_check(allowed_currencies), nullable=False),
+            "amount": Column(float, checks=_GT0, coerce=True, nullable=False),
             "description": Column(str, nullable=True),
         },
         checks=[_dup_check(["entity", "invoice_id"], "sales")],
@@ -29,6 +54,7 @@ def sales_schema(allowed_currencies: tuple[str, ...]) -> pa.DataFrameSchema:
     )
 
 
+@lru_cache(maxsize=16)
 def expenses_schema(allowed_currencies: tuple[str, ...]) -> pa.DataFrameSchema:
     return pa.DataFrameSchema(
         {
@@ -36,8 +62,8 @@ def expenses_schema(allowed_currencies: tuple[str, ...]) -> pa.DataFrameSchema:
             "entity": Column(str, nullable=False),
             "bill_id": Column(str, nullable=False),
             "account_code": Column(str, nullable=False),
-            "currency": Column(str, checks=Check.isin(list(allowed_currencies)), nullable=False),
-            "amount": Column(float, checks=Check.gt(0), coerce=True, nullable=False),
+            "currency": Column(str, checks=_currency_check(allowed_currencies), nullable=False),
+            "amount": Column(float, checks=_GT0, coerce=True, nullable=False),
             "description": Column(str, nullable=True),
         },
         checks=[_dup_check(["entity", "bill_id"], "expenses")],
@@ -45,20 +71,21 @@ def expenses_schema(allowed_currencies: tuple[str, ...]) -> pa.DataFrameSchema:
     )
 
 
+@lru_cache(maxsize=16)
 def payroll_schema(allowed_currencies: tuple[str, ...]) -> pa.DataFrameSchema:
     return pa.DataFrameSchema(
         {
             "month": Column(str, nullable=False),
             "entity": Column(str, nullable=False),
             "employee_id": Column(str, nullable=False),
-            "currency": Column(str, checks=Check.isin(list(allowed_currencies)), nullable=False),
-            "gross": Column(float, checks=Check.ge(0), coerce=True, nullable=False),
-            "deductions": Column(float, checks=Check.ge(0), coerce=True, nullable=False),
-            "net": Column(float, checks=Check.ge(0), coerce=True, nullable=False),
+            "currency": Column(str, checks=_currency_check(allowed_currencies), nullable=False),
+            "gross": Column(float, checks=_GE0, coerce=True, nullable=False),
+            "deductions": Column(float, checks=_GE0, coerce=True, nullable=False),
+            "net": Column(float, checks=_GE0, coerce=True, nullable=False),
         },
         checks=[
             Check(
-                lambda df: (df["gross"] - df["deductions"] - df["net"]).abs().max() < 0.01,
+                _payroll_identity_ok,
                 element_wise=False,
                 error="Payroll identity gross - deductions = net violated",
             ),
@@ -67,50 +94,61 @@ def payroll_schema(allowed_currencies: tuple[str, ...]) -> pa.DataFrameSchema:
     )
 
 
+@lru_cache(maxsize=16)
 def inventory_schema(allowed_currencies: tuple[str, ...]) -> pa.DataFrameSchema:
     return pa.DataFrameSchema(
         {
             "date": Column(pa.DateTime, coerce=True, nullable=False),
             "entity": Column(str, nullable=False),
             "sku": Column(str, nullable=False),
-            "movement_type": Column(str, checks=Check.isin(["receipt", "issue", "adjustment"]), nullable=False),
-            "qty": Column(float, checks=Check.ne(0), coerce=True, nullable=False),
-            "unit_cost": Column(float, checks=Check.ge(0), coerce=True, nullable=False),
-            "currency": Column(str, checks=Check.isin(list(allowed_currencies)), nullable=False),
+            "movement_type": Column(str, checks=_MOVEMENT_TYPES, nullable=False),
+            "qty": Column(float, checks=_NE0, coerce=True, nullable=False),
+            "unit_cost": Column(float, checks=_GE0, coerce=True, nullable=False),
+            "currency": Column(str, checks=_currency_check(allowed_currencies), nullable=False),
         },
         strict=True,
     )
 
 
+@lru_cache(maxsize=16)
 def fx_schema(allowed_currencies: tuple[str, ...], base_currency: str) -> pa.DataFrameSchema:
     return pa.DataFrameSchema(
         {
             "date": Column(pa.DateTime, coerce=True, nullable=False),
-            "from_currency": Column(str, checks=Check.isin(list(allowed_currencies)), nullable=False),
+            "from_currency": Column(str, checks=_currency_check(allowed_currencies), nullable=False),
             "to_currency": Column(str, checks=Check.isin([base_currency]), nullable=False),
-            "rate": Column(float, checks=Check.gt(0), coerce=True, nullable=False),
+            "rate": Column(float, checks=_GT0, coerce=True, nullable=False),
         },
         checks=[_dup_check(["date", "from_currency", "to_currency"], "fx_rates")],
         strict=True,
     )
 
 
+_FAILURE_CASE_COLUMNS = ["index", "column", "check", "failure_case", "schema_context", "check_number"]
+
+
 def validate_or_collect(
     df: pd.DataFrame,
     schema: pa.DataFrameSchema,
     dataset_name: str,
     issues: list[pd.DataFrame],
 ) -> pd.DataFrame | None:
+    """
+    Validates df against schema; on failure appends the failure cases to `issues` and returns None.
+    Callers concatenate `issues` once at the end (pd.concat(issues, ignore_index=True)).
+    """
     try:
         return schema.validate(df, lazy=True)
     except pa.errors.SchemaErrors as e:
-        fc = e.failure_cases.copy()
+        fc = e.failure_cases
         if "index" not in fc.columns and "row" in fc.columns:
-            fc["index"] = fc["row"]
-        fc["dataset"] = dataset_name
-        keep = [c for c in ["dataset", "index", "column", "check", "failure_case", "schema_context"] if c in fc.columns]
-        rest = [c for c in fc.columns if c not in keep]
-        fc = fc[keep + rest]
+            fc = fc.rename(columns={"row": "index"})
+        # project onto the audit columns only; other failure_cases columns are never written
+        fc = fc.reindex(columns=_FAILURE_CASE_COLUMNS)
+        fc.insert(0, "dataset", dataset_labels([dataset_name], [len(fc)]))
+        # Arrow-backed strings so severity/summary isin, eq and str.contains run as Arrow kernels
+        for c in ("column", "check", "schema_context"):
+            fc[c] = fc[c].astype("string[pyarrow]")
         issues.append(fc)
         return None
 
@@ -118,13 +156,41 @@ def validate_or_collect(
 # --- DQ severity + summary helpers (audit-ready) ---
 
 DATASETS = ["sales", "expenses", "payroll", "inventory_movements", "fx_rates"]
+SEVERITY_DTYPE = pd.CategoricalDtype(["ERROR", "WARN"])
+_ERROR_CHECK_RE = re.compile(r"required|dtype|account_in_coa", re.IGNORECASE)
+# key fields whose failures are ERROR; the DQ `column` label is Arrow-backed, so Series.isin runs as Arrow is_in
+_ERROR_COLS = frozenset(
+    {
+        "account_code",
+        "date",
+        "invoice_id",
+        "bill_id",
+        "employee_id",
+        "sku",
+        "currency",
+        "from_currency",
+        "to_currency",
+        "rate",
+    }
+)
 
 
-def add_severity(dq_exceptions: pd.DataFrame) -> pd.DataFrame:
+def dataset_labels(names: list[str], counts: list[int]) -> pd.Categorical:
+    """
+    Builds the DQ `dataset` column: names[i] repeated counts[i] times, as int8 codes over DATASETS.
+    Every exceptions chunk shares the same categories, so pd.concat keeps the column categorical.
+    """
+    categories = DATASETS + [n for n in dict.fromkeys(names) if n not in DATASETS]
+    codes = np.repeat(np.array([categories.index(n) for n in names], dtype=np.int8), counts)
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def add_severity(dq_exceptions: pd.DataFrame, *, inplace: bool = False) -> pd.DataFrame:
     """
     Adds a severity column to DQ exceptions:
     - ERROR: key fields, type/required checks, account mapping, FX dataset issues
     - WARN: non-critical issues (extend later)
+    With inplace=True the column is added to dq_exceptions itself (for callers that discard the input).
     """
     if dq_exceptions is None:
         return pd.DataFrame(
@@ -140,45 +206,33 @@ def add_severity(dq_exceptions: pd.DataFrame) -> pd.DataFrame:
             ]
         )
 
-    dq = dq_exceptions.copy()
+    # only a column is added, so a shallow copy (shared blocks) is enough when not working in place
+    dq = dq_exceptions if inplace else dq_exceptions.copy(deep=False)
 
     if dq.empty:
         if "severity" not in dq.columns:
-            dq["severity"] = pd.Series(dtype="string")
+            dq["severity"] = pd.Categorical([], dtype=SEVERITY_DTYPE)
         return dq
 
-    dq["severity"] = "WARN"
+    is_error = np.zeros(len(dq), dtype=bool)
 
     # Column-based criticals
-    error_cols = {
-        "account_code",
-        "date",
-        "invoice_id",
-        "bill_id",
-        "employee_id",
-        "sku",
-        "currency",
-        "from_currency",
-        "to_currency",
-        "rate",
-    }
     if "column" in dq.columns:
-        dq.loc[dq["column"].isin(error_cols), "severity"] = "ERROR"
+        is_error |= dq["column"].isin(_ERROR_COLS).to_numpy()
 
     # Any FX dataset issues are ERROR
     if "dataset" in dq.columns:
-        dq.loc[dq["dataset"].eq("fx_rates"), "severity"] = "ERROR"
+        is_error |= dq["dataset"].eq("fx_rates").to_numpy(dtype=bool, na_value=False)
 
-    # Any schema "required"/"dtype" checks are ERROR
+    # Schema "required"/"dtype" checks and COA membership violations ("account_in_coa", added in pipeline)
+    # are ERROR; one combined pattern scans the check text once
     if "check" in dq.columns:
-        check_str = dq["check"].astype(str)
-        dq.loc[check_str.str.contains("required", case=False, na=False), "severity"] = "ERROR"
-        dq.loc[check_str.str.contains("dtype", case=False, na=False), "severity"] = "ERROR"
+        # same Arrow dtype validate_or_collect produces (a no-op there); astype(str) would fall back to object
+        check = dq["check"].astype("string[pyarrow]")
+        is_error |= check.str.contains(_ERROR_CHECK_RE, na=False).to_numpy(dtype=bool, na_value=False)
 
-    # COA membership violations -> ERROR
-    # (we will add these checks in pipeline using check name "account_in_coa")
-    if "check" in dq.columns:
-        dq.loc[dq["check"].astype(str).str.contains("account_in_coa", case=False, na=False), "severity"] = "ERROR"
+    # ERROR is category code 0, WARN is 1
+    dq["severity"] = pd.Categorical.from_codes((~is_error).astype(np.int8), dtype=SEVERITY_DTYPE)
 
     return dq
 
@@ -199,51 +253,47 @@ def dq_overall_status(dq_exceptions: pd.DataFrame, fail_on: str = "ERROR") -> st
     if "severity" not in dq_exceptions.columns:
         return "FAIL"  # safest fallback
 
-    return "FAIL" if (dq_exceptions["severity"] == "ERROR").any() else "PASS"
+    severity = dq_exceptions["severity"]
+    if isinstance(severity.dtype, pd.CategoricalDtype) and "ERROR" in severity.cat.categories:
+        # int8 code scan instead of string comparison
+        has_error = (severity.cat.codes.to_numpy() == severity.cat.categories.get_loc("ERROR")).any()
+    else:
+        has_error = (severity.to_numpy() == "ERROR").any()
+    return "FAIL" if has_error else "PASS"
 
 
 def dq_summary_table(dq_exceptions: pd.DataFrame, fail_on: str = "ERROR") -> pd.DataFrame:
     fail_on = (fail_on or "ERROR").upper()
 
-    # start with all datasets, zero counts
-    base = pd.DataFrame({"dataset": DATASETS, "error_count": 0, "warn_count": 0})
-
     if dq_exceptions is None or dq_exceptions.empty:
-        base["issue_count"] = 0
+        # all datasets, zero counts
+        zeros = np.zeros(len(DATASETS), dtype=np.int32)
+        base = pd.DataFrame({"dataset": DATASETS, "error_count": zeros, "warn_count": zeros})
+        base["issue_count"] = zeros
         base["status"] = "PASS"
         return base[["dataset", "error_count", "warn_count", "issue_count", "status"]]
 
-    dq = dq_exceptions.copy()
-    if "severity" not in dq.columns:
-        dq["severity"] = "ERROR"
-
-    counts = dq.groupby(["dataset", "severity"]).size().unstack(fill_value=0).reset_index()
-
-    # Normalize column names
-    if "ERROR" not in counts.columns:
-        counts["ERROR"] = 0
-    if "WARN" not in counts.columns:
-        counts["WARN"] = 0
-
-    counts = counts.rename(columns={"ERROR": "error_count", "WARN": "warn_count"})
-
-    out = base.merge(counts, on="dataset", how="left", suffixes=("", "_y"))
-    # if merge created *_y cols, use them
-    for c in ["error_count", "warn_count"]:
-        y = f"{c}_y"
-        if y in out.columns:
-            out[c] = out[y].fillna(out[c]).astype(int)
-            out = out.drop(columns=[y])
-        else:
-            out[c] = out[c].fillna(0).astype(int)
+    dq = dq_exceptions if "severity" in dq_exceptions.columns else dq_exceptions.assign(severity="ERROR")
+
+    # only observed (dataset, severity) pairs, unsorted: the result is reindexed onto DATASETS right after,
+    # and datasets without issues get zeros
+    out = (
+        dq.groupby(["dataset", "severity"], observed=True, sort=False)
+        .size()
+        .unstack("severity", fill_value=0)
+        .reindex(index=DATASETS, columns=["ERROR", "WARN"], fill_value=0)
+        .astype(np.int32)
+        .rename(columns={"ERROR": "error_count", "WARN": "warn_count"})
+        .rename_axis(index="dataset", columns=None)
+        .reset_index()
+    )
 
     out["issue_count"] = out["error_count"] + out["warn_count"]
 
     if fail_on == "NEVER":
         out["status"] = "PASS"
-    elif fail_on == "WARN":
-        out["status"] = out["issue_count"].apply(lambda x: "FAIL" if x > 0 else "PASS")
-    else:  # ERROR
-        out["status"] = out["error_count"].apply(lambda x: "FAIL" if x > 0 else "PASS")
+    else:  # WARN fails on any issue, ERROR only on errors
+        failing = out["issue_count" if fail_on == "WARN" else "error_count"].to_numpy() > 0
+        out["status"] = np.where(failing, "FAIL", "PASS")
 
     return out[["dataset", "error_count", "warn_count", "issue_count", "status"]]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
 
@@ -126,3 +127,31 @@ def kpi_monthly(fact: pd.DataFrame, dim_accounts: pd.DataFrame) -> pd.DataFrame:
     wide["gross_profit"] = (wide["Revenue"] + wide["COGS"]).round(2)
     wide["operating_profit"] = (wide["gross_profit"] + wide["Expense"]).round(2)
     return wide.sort_values(["entity", "month"]).reset_index(drop=True)
+
+
+def month_series(s: pd.Series) -> pd.Series:
+    # one vectorized parse; values that do not parse keep their first 7 chars (e.g. "2025-12")
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return s.dt.strftime("%Y-%m")
+    months = pd.to_datetime(s, errors="coerce").dt.strftime("%Y-%m")
+    return months.fillna(s.astype(str).str.slice(0, 7)).where(s.notna())
+
+
+def infer_month(kpi: pd.DataFrame) -> str | None:
+    if kpi.empty or "month" not in kpi.columns:
+        return None
+    months = sorted(month_series(kpi["month"]).dropna().unique())
+    return months[-1] if months else None
+
+
+def add_margin_cols(kpi: pd.DataFrame) -> pd.DataFrame:
+    # adds the margin columns to kpi in place (callers pass a frame they own) and returns it
+    if "Revenue" not in kpi.columns:
+        return kpi
+    # plain float64 arrays: no index alignment; zero revenue -> NaN margin
+    rev = pd.to_numeric(kpi["Revenue"], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    for src, dst in (("gross_profit", "gross_margin_pct"), ("operating_profit", "operating_margin_pct")):
+        if src in kpi.columns:
+            num = pd.to_numeric(kpi[src], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+            kpi[dst] = np.divide(num, rev, out=np.full(len(rev), np.nan), where=rev != 0) * 100
+    return kpi
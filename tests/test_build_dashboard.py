@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("plotly")
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "build_dashboard.py"
+_spec = importlib.util.spec_from_file_location("build_dashboard", SCRIPT)
+bd = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bd)
+
+
+DIM = pd.DataFrame(
+    {
+        "account_code": ["4000", "6000", "6100"],
+        "account_name": ["Sales", "Rent", "Travel"],
+        "account_type": ["Revenue", "Expense", "Expense"],
+    }
+)
+
+
+def _expense_chart(fact: pd.DataFrame) -> str:
+    empty = pd.DataFrame()
+    fragments = bd._render_fragments("2025-12", bd._as_category(fact), bd._as_category(DIM.copy()), empty, empty, empty)
+    return fragments["exp_chart_html"]
+
+
+def test_lttb_keeps_endpoints_and_peak() -> None:
+    y = np.sin(np.linspace(0, 20, 5000))
+    y[1234] = 10.0
+    idx = bd._lttb_indices(y, 100)
+    assert len(idx) == 100
+    assert idx[0] == 0 and idx[-1] == len(y) - 1
+    assert (np.diff(idx) > 0).all()
+    assert 1234 in idx
+
+
+def test_lttb_short_series_untouched() -> None:
+    assert bd._lttb_indices(np.arange(5.0), 100).tolist() == [0, 1, 2, 3, 4]
+
+
+def test_downsample() -> None:
+    n = 3000
+    df = pd.DataFrame(
+        {"entity": ["A"] * n + ["B"] * 10, "month": list(range(n)) + list(range(10)), "Revenue": np.arange(n + 10.0)}
+    )
+    out = bd._downsample(df, "Revenue", n_out=100)
+    assert (out["entity"] == "A").sum() == 100
+    assert (out["entity"] == "B").sum() == 10
+
+    small = df[df["entity"] == "B"]
+    assert bd._downsample(small, "Revenue", n_out=100) is small
+
+
+def test_downsample_without_groups() -> None:
+    empty = pd.DataFrame({"entity": [], "month": [], "Revenue": []})
+    assert bd._downsample(empty, "Revenue").empty
+    null_entity = pd.DataFrame({"entity": [None, None], "month": ["2025-11", "2025-12"], "Revenue": [1.0, 2.0]})
+    assert len(bd._downsample(null_entity, "Revenue")) == 2
+
+
+def test_expense_top_k_skips_null_and_unmapped_codes() -> None:
+    fact = pd.DataFrame(
+        {
+            "account_code": ["6000", "6100", "6100", None, "9999", "4000"],
+            "amount_base": [-5.0, 2.0, 2.0, 100.0, 50.0, 70.0],
+        }
+    )
+    html = _expense_chart(fact)
+    assert "6000 - Rent" in html and "6100 - Travel" in html
+    assert "9999" not in html and "4000" not in html
+
+
+def test_expense_chart_all_null_accounts() -> None:
+    fact = pd.DataFrame({"account_code": pd.Series([None, None], dtype=object), "amount_base": [1.0, 2.0]})
+    assert "No expense chart available." in _expense_chart(fact)
+
+
+@pytest.fixture
+def curated(tmp_path: Path) -> Path:
+    curated_dir = tmp_path / "curated"
+    curated_dir.mkdir()
+    pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2025-12-01", "2025-12-15", "2025-12-31"]),
+            "entity": ["TZ01", "TZ01", "TZ01"],
+            "account_code": ["4000", "6000", "6100"],
+            "amount_base": [1000.0, -200.0, -50.0],
+        }
+    ).to_parquet(curated_dir / "fact_transactions.parquet", index=False)
+    DIM.to_parquet(curated_dir / "dim_accounts.parquet", index=False)
+    pd.DataFrame(
+        {"entity": ["TZ01"], "month": ["2025-12"], "Revenue": [1000.0], "Expense": [250.0], "operating_profit": [750.0]}
+    ).to_parquet(curated_dir / "kpi_monthly.parquet", index=False)
+    return curated_dir
+
+
+def _no_render(*args: object) -> dict[str, str]:
+    raise AssertionError("fragments should have come from the cache")
+
+
+def _without_build_time(html: str) -> list[str]:
+    return [line for line in html.splitlines() if "Built:" not in line]
+
+
+def test_cache_hit_skips_rendering(curated: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    cache_dir = tmp_path / "cache"
+    first = bd.build_dashboard(curated, "2025-12", tmp_path / "a.html", cache_dir=cache_dir).read_text()
+    assert len(list((cache_dir / "2025-12").iterdir())) == 1
+
+    monkeypatch.setattr(bd, "_render_fragments", _no_render)
+    second = bd.build_dashboard(curated, "2025-12", tmp_path / "b.html", cache_dir=cache_dir).read_text()
+    assert _without_build_time(first) == _without_build_time(second)
+
+
+def test_cache_invalidated_by_inputs_and_plotly_version(
+    curated: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache_dir = tmp_path / "cache"
+    bd.build_dashboard(curated, "2025-12", tmp_path / "a.html", cache_dir=cache_dir)
+    (old_key,) = (cache_dir / "2025-12").iterdir()
+
+    DIM.iloc[:2].to_parquet(curated / "dim_accounts.parquet", index=False)
+    bd.build_dashboard(curated, "2025-12", tmp_path / "a.html", cache_dir=cache_dir)
+    (new_key,) = (cache_dir / "2025-12").iterdir()
+    assert new_key != old_key
+
+    monkeypatch.setattr(bd.plotly, "__version__", "0.0.0")
+    bd.build_dashboard(curated, "2025-12", tmp_path / "a.html", cache_dir=cache_dir)
+    (bumped_key,) = (cache_dir / "2025-12").iterdir()
+    assert bumped_key != new_key
+
+
+def test_no_cache_dir_writes_nothing(curated: Path, tmp_path: Path) -> None:
+    before = set(tmp_path.rglob("*"))
+    out = bd.build_dashboard(curated, "2025-12", tmp_path / "a.html")
+    assert set(tmp_path.rglob("*")) - before == {out}
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "export_bi_datasets.py"
+_spec = importlib.util.spec_from_file_location("export_bi_datasets", SCRIPT)
+bi = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bi)
+
+DATES = ["2025-11-30", "2025-12-01", "2025-12-31", "2026-01-01"]
+
+
+def _write_fact(path: Path, date: pa.Array) -> Path:
+    pq.write_table(pa.table({"date": date, "amount": [1.0, 2.0, 3.0, 4.0]}), path)
+    return path
+
+
+def test_filter_fact_to_month_timestamp(tmp_path: Path) -> None:
+    fact = _write_fact(tmp_path / "f.parquet", pa.array(pd.to_datetime(DATES)))
+    out = bi.filter_fact_to_month(fact, "2025-12")
+    assert out["amount"].tolist() == [2.0, 3.0]
+
+
+def test_filter_fact_to_month_tz_aware_uses_local_month(tmp_path: Path) -> None:
+    local = pd.to_datetime(["2025-11-30 23:00", "2025-12-01 01:00", "2025-12-31 23:00", "2026-01-01 01:00"])
+    fact = _write_fact(tmp_path / "f.parquet", pa.array(local.tz_localize("Africa/Nairobi")))
+    out = bi.filter_fact_to_month(fact, "2025-12")
+    assert out["amount"].tolist() == [2.0, 3.0]
+
+
+def test_filter_fact_to_month_date32(tmp_path: Path) -> None:
+    fact = _write_fact(tmp_path / "f.parquet", pa.array(pd.to_datetime(DATES).date, type=pa.date32()))
+    out = bi.filter_fact_to_month(fact, "2025-12", ["amount"])
+    assert list(out.columns) == ["amount"]
+    assert out["amount"].tolist() == [2.0, 3.0]
+
+
+def test_filter_fact_to_month_text_dates(tmp_path: Path) -> None:
+    fact = _write_fact(tmp_path / "f.parquet", pa.array(["2025-11-30", "2025-12-01", "bad", "2025-12-31"]))
+    out = bi.filter_fact_to_month(fact, "2025-12")
+    assert out["amount"].tolist() == [2.0, 4.0]
+
+    # projected without the date column: it is read for the filter, then dropped
+    out = bi.filter_fact_to_month(fact, "2025-12", ["amount"])
+    assert list(out.columns) == ["amount"]
+
+    # the result is owned by the caller
+    out["month"] = "2025-12"
+
+
+def test_filter_fact_to_month_text_dates_with_offset(tmp_path: Path) -> None:
+    text = [
+        "2025-11-30T23:30:00+03:00",
+        "2025-12-01T00:30:00+03:00",
+        "2025-12-31T23:30:00+03:00",
+        "2026-01-01T00:30:00+03:00",
+    ]
+    fact = _write_fact(tmp_path / "f.parquet", pa.array(text))
+    out = bi.filter_fact_to_month(fact, "2025-12")
+    assert out["amount"].tolist() == [2.0, 3.0]
+
+
+def test_read_csv_keeps_null_labels(tmp_path: Path) -> None:
+    path = tmp_path / "dq_exceptions.csv"
+    path.write_text("dataset,column,check\nsales,,Duplicates found\nsales,amount,greater_than(0)\n")
+    dq = bi._read_csv(path)
+    assert dq["column"].isna().tolist() == [True, False]
+    assert dq["column"].isna().tolist() == pd.read_csv(path)["column"].isna().tolist()
+
+
+def test_write_csv_round_trip(tmp_path: Path) -> None:
+    df = pd.DataFrame(
+        {
+            "day": pd.to_datetime(["2025-12-01", "2025-12-02"]),
+            "ts": pd.to_datetime(["2025-12-01 10:30:00", "2025-12-02 00:00:01"]),
+            "code": ["4000", None],
+            "amount": [1.5, float("nan")],
+            "flag": [True, False],
+        }
+    )
+    path = tmp_path / "out.csv"
+    bi._write_csv(df, path)
+
+    text = path.read_text()
+    assert "2025-12-01," in text  # date-only timestamps as dates
+    assert "2025-12-01 10:30:00," in text  # no .000000 suffix
+    back = pd.read_csv(path, dtype={"code": str}, parse_dates=["day", "ts"])
+    pd.testing.assert_frame_equal(back, df, check_dtype=False)
+
+
+def test_write_csv_mixed_object_column_falls_back(tmp_path: Path) -> None:
+    path = tmp_path / "out.csv"
+    bi._write_csv(pd.DataFrame({"failure_case": pd.Series([1, "GBP"], dtype=object)}), path)
+    assert path.read_text().splitlines() == ["failure_case", "1", "GBP"]
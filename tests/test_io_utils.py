@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from finance_etl.io_utils import read_csv
+
+
+def test_read_csv_arrow_path(tmp_path: Path) -> None:
+    path = tmp_path / "sales.csv"
+    path.write_text(
+        "date,account_code,currency,amount,description\n2025-12-01,4000,USD,0.1,\n2025-12-02,0400,TZS,2,x\n"
+    )
+    df = read_csv(path, dtype={"account_code": str, "currency": str}, parse_dates=["date"])
+    assert df["account_code"].tolist() == ["4000", "0400"]  # codes keep leading zeros
+    assert pd.api.types.is_datetime64_any_dtype(df["date"])
+    assert df["amount"].tolist() == [0.1, 2.0]
+    assert df["description"].isna().tolist() == [True, False]
+
+
+def test_read_csv_falls_back_to_pandas(tmp_path: Path) -> None:
+    # a malformed date cannot be converted by Arrow; pandas keeps it for schema validation to report
+    path = tmp_path / "sales.csv"
+    path.write_text("date,account_code\n2025-12-01,4000\nnot-a-date,0400\n")
+    df = read_csv(path, dtype={"account_code": str}, parse_dates=["date"])
+    assert df["account_code"].tolist() == ["4000", "0400"]
+    assert df["date"].tolist() == ["2025-12-01", "not-a-date"]
+
+
+def test_read_csv_missing_file(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        read_csv(tmp_path / "missing.csv")
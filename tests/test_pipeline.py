@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from finance_etl.config import settings
+from finance_etl.pipeline import _month_slice, _month_window, run_month
+from finance_etl.sample_data import generate_synthetic_raw
+
+DATES = [
+    "2025-11-30 23:59:59",
+    "2025-12-01 00:00:00",
+    "2025-12-15 12:00:00",
+    "2025-12-31 23:59:59",
+    "2026-01-01 00:00:00",
+]
+
+
+def _frame(dates: list[str | None]) -> pd.DataFrame:
+    return pd.DataFrame({"date": pd.to_datetime(dates), "amount": range(len(dates))})
+
+
+def test_month_slice_sorted_boundaries() -> None:
+    start, end = _month_window("2025-12")
+    out = _month_slice(_frame(DATES), "date", start, end)
+    # start is inclusive, end exclusive
+    assert out["amount"].tolist() == [1, 2, 3]
+
+
+def test_month_slice_unsorted_and_missing_dates() -> None:
+    start, end = _month_window("2025-12")
+    df = _frame([DATES[4], DATES[2], None, DATES[0], DATES[1], DATES[3]])
+    out = _month_slice(df, "date", start, end)
+    assert out["amount"].tolist() == [1, 4, 5]
+
+
+def test_month_slice_outside_range_and_empty() -> None:
+    start, end = _month_window("2024-06")
+    assert _month_slice(_frame(DATES), "date", start, end).empty
+    assert _month_slice(_frame([]), "date", start, end).empty
+
+
+def _raw_with_dq_issues(tmp_path: Path) -> tuple[Path, Path]:
+    raw_dir, reference_dir = tmp_path / "raw", tmp_path / "reference"
+    reference_dir.mkdir()
+    repo_root = Path(__file__).resolve().parents[1]
+    shutil.copy(repo_root / "data" / "reference" / "chart_of_accounts.csv", reference_dir / "chart_of_accounts.csv")
+    generate_synthetic_raw(raw_dir, month="2025-12", seed=42)
+
+    sales = pd.read_csv(raw_dir / "sales.csv", dtype=str)
+    sales.loc[0, "account_code"] = "99999999"
+    sales.loc[1, "currency"] = "GBP"
+    sales.loc[2, "amount"] = "-5"
+    pd.concat([sales, sales.iloc[[3]]]).to_csv(raw_dir / "sales.csv", index=False)
+    expenses = pd.read_csv(raw_dir / "expenses.csv", dtype=str)
+    expenses.loc[4, "account_code"] = "88888888"
+    expenses.to_csv(raw_dir / "expenses.csv", index=False)
+    payroll = pd.read_csv(raw_dir / "payroll.csv", dtype=str)
+    payroll.loc[0, "net"] = "1.0"
+    payroll.to_csv(raw_dir / "payroll.csv", index=False)
+    inventory = pd.read_csv(raw_dir / "inventory_movements.csv", dtype=str)
+    inventory.loc[0, "movement_type"] = "theft"
+    inventory.to_csv(raw_dir / "inventory_movements.csv", index=False)
+    return raw_dir, reference_dir
+
+
+def test_run_month_writes_dq_exceptions_on_failure(tmp_path: Path) -> None:
+    raw_dir, reference_dir = _raw_with_dq_issues(tmp_path)
+    curated_dir = tmp_path / "curated"
+
+    with pytest.raises(ValueError, match="Data quality checks failed"):
+        run_month(settings, "2025-12", raw_dir, curated_dir, reference_dir, fail_on="ERROR")
+
+    dq = pd.read_csv(curated_dir / "dq_exceptions.csv", dtype={"failure_case": str})
+    assert list(dq.columns) == [
+        "dataset",
+        "index",
+        "column",
+        "check",
+        "failure_case",
+        "schema_context",
+        "check_number",
+        "severity",
+    ]
+    # schema failures in dataset order, then the COA misses for sales and expenses
+    rows = list(dq[["dataset", "index", "column", "severity"]].itertuples(index=False, name=None))
+    assert [(d, None if pd.isna(i) else int(i), None if pd.isna(c) else c, s) for d, i, c, s in rows] == [
+        ("sales", None, None, "WARN"),
+        ("sales", 1, "currency", "ERROR"),
+        ("sales", 2, "amount", "WARN"),
+        ("payroll", None, None, "WARN"),
+        ("inventory_movements", 0, "movement_type", "WARN"),
+        ("sales", 0, "account_code", "ERROR"),
+        ("expenses", 4, "account_code", "ERROR"),
+    ]
+    coa = dq[dq["check"] == "account_in_coa"]
+    assert coa["failure_case"].tolist() == ["99999999", "88888888"]
+
+    summary = pd.read_csv(curated_dir / "dq_summary.csv").set_index("dataset")
+    assert summary.loc["sales", ["error_count", "warn_count"]].tolist() == [2, 2]
+    assert summary.loc["sales", "status"] == "FAIL"
+    assert summary.loc["fx_rates", "status"] == "PASS"
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from finance_etl.quality import SEVERITY_DTYPE, add_severity, dq_overall_status, dq_summary_table
+
+
+def _exceptions() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "dataset": ["sales", "sales", "payroll", "fx_rates"],
+            "column": ["currency", "amount", None, "rate"],
+            "check": ["isin(['USD'])", "greater_than(0)", "Payroll identity", "greater_than(0)"],
+        }
+    )
+
+
+def test_add_severity_is_categorical() -> None:
+    dq = add_severity(_exceptions())
+    assert dq["severity"].dtype == SEVERITY_DTYPE
+    assert dq["severity"].tolist() == ["ERROR", "WARN", "WARN", "ERROR"]
+
+
+def test_summary_and_status_with_categorical_severity() -> None:
+    dq = add_severity(_exceptions())
+
+    summary = dq_summary_table(dq, fail_on="ERROR").set_index("dataset")
+    assert summary.loc["sales", ["error_count", "warn_count", "issue_count"]].tolist() == [1, 1, 2]
+    assert summary.loc["expenses", "issue_count"] == 0
+    assert summary.loc["sales", "status"] == "FAIL"
+    assert summary.loc["payroll", "status"] == "PASS"
+    assert dq_overall_status(dq, fail_on="ERROR") == "FAIL"
+
+    # NEVER reports the real counts but never fails
+    never = dq_summary_table(dq, fail_on="NEVER").set_index("dataset")
+    assert never.loc["sales", "error_count"] == 1
+    assert (never["status"] == "PASS").all()
+    assert dq_overall_status(dq, fail_on="NEVER") == "PASS"
+
+
+def test_status_with_plain_string_severity() -> None:
+    # e.g. dq_exceptions.csv read back from disk
+    dq = pd.DataFrame({"dataset": ["sales"], "severity": ["ERROR"]})
+    assert dq_overall_status(dq) == "FAIL"
+    assert dq_summary_table(dq).set_index("dataset").loc["sales", "error_count"] == 1
+
+
+def test_warn_only_exceptions() -> None:
+    dq = add_severity(_exceptions().iloc[[1, 2]])
+
+    summary = dq_summary_table(dq, fail_on="ERROR")
+    assert summary["error_count"].sum() == 0
+    assert (summary["status"] == "PASS").all()
+    assert dq_overall_status(dq, fail_on="ERROR") == "PASS"
+
+    warn = dq_summary_table(dq, fail_on="WARN").set_index("dataset")
+    assert warn.loc["sales", "status"] == "FAIL"
+    assert dq_overall_status(dq, fail_on="WARN") == "FAIL"
+
+
+def test_add_severity_keeps_input_unless_inplace() -> None:
+    ex = _exceptions()
+    add_severity(ex)
+    assert "severity" not in ex.columns
+    assert add_severity(ex, inplace=True) is ex
+    assert "severity" in ex.columns